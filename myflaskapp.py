@@ -22,7 +22,7 @@ web GIS tools for exploring greenspaces in Edinburgh:
 
 Data Sources & Stack
 -------------------
-- Backend: Python Flask
+- Backend: Python Flask (responses compressed with Flask-Compress)
 - Database: Oracle (Greenspace, SIMD_Datazone, Recreation_Index, Facility tables/views)
 - Frontend: Leaflet.js + HTML/CSS/JavaScript templates
 - Static datasets: GeoJSON layers and local images under /static
@@ -35,7 +35,10 @@ loader attempts multiple folder-name strategies:
 
 Deployment Notes
 ----------------
-- Reads the Oracle password from `~/.ora_student.txt` via `get_password()`.
+- Reads the Oracle password from `~/.ora_student.txt` once at import (`DB_PASSWORD`);
+  startup fails fast if the file is missing.
+- Opens one python-oracledb connection pool per worker at import (`POOL`);
+  routes acquire pooled connections rather than connecting per request.
 - Designed for deployment behind Gunicorn on devapps (SCRIPT_NAME configured externally).
 - Routes render Jinja2 templates in `templates/` and rely on modular JS in `static/js/`.
 
@@ -45,144 +48,437 @@ Per request, this file is presented as a submission/appendix snapshot.
 """
 
 
-from flask import Flask, render_template, request, jsonify, url_for
+from flask import Flask, render_template, request, jsonify, url_for, send_from_directory
+from flask_compress import Compress
+from jinja2.utils import htmlsafe_json_dumps
+from werkzeug.security import safe_join
 import oracledb
 from pathlib import Path
 import os
 import sys
 import logging
-import math
-import collections
+import re
+import functools
 import json  
+import threading
+import time
+import numpy as np
+import orjson
 
 app = Flask(__name__)
 
+# Brotli/gzip-encode JSON and HTML responses (large park payloads and search results)
+# and static files, including GeoJSON layers without a fresh precompressed sidecar
+# (application/geo+json is not in Flask-Compress's default list).
+# Static files are streamed, and Flask-Compress streams only br (not gzip), so
+# gzip-only clients receive those uncompressed.
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 500
+app.config['COMPRESS_MIMETYPES'] = [
+    'text/html', 'text/css', 'text/javascript', 'application/javascript',
+    'application/json', 'application/geo+json', 'image/svg+xml'
+]
+Compress(app)
+
 # ------------------------
-# PASSWORD READER
+# PRECOMPRESSED GEOJSON
 # ------------------------
-def get_password(passfile='.ora_student.txt'):
-    """Read Oracle database password from home directory"""
-    home = Path.home()
-    passfile = os.path.join(home, passfile)
+@app.before_request
+def send_precompressed_geojson():
+    """
+    Answer static .geojson requests from the `.geojson.gz` sidecar written by
+    support_scripts/precompress_static.py, so large layers are not recompressed per
+    request. Falls through to the normal static route if the client does not accept
+    gzip or the sidecar is missing or older than the layer.
+    """
+    if request.endpoint != 'static' or not request.accept_encodings['gzip']:
+        return None
+    filename = request.view_args.get('filename', '')
+    if not filename.endswith('.geojson'):
+        return None
+
+    source = safe_join(app.static_folder, filename)
+    if source is None:
+        return None
     try:
-        with open(passfile) as f:
-            return f.readline().strip()
-    except FileNotFoundError:
-        logging.error("Password file not found.")
-        sys.exit(1)
+        if os.stat(source + '.gz').st_mtime < os.stat(source).st_mtime:
+            return None
+    except OSError:
+        return None
+
+    # Content-Encoding is set, so Flask-Compress leaves the response alone
+    response = send_from_directory(
+        app.static_folder, filename + '.gz',
+        mimetype='application/geo+json',
+        download_name=os.path.basename(filename),
+        max_age=app.get_send_file_max_age(filename)
+    )
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+# ------------------------
+# DATABASE FETCH TUNING
+# ------------------------
+# Rows fetched per network round-trip on the bulk park SELECTs.
+# prefetchrows is one higher so the final empty fetch needs no extra trip.
+FETCH_ARRAYSIZE = 1000
+FETCH_PREFETCHROWS = FETCH_ARRAYSIZE + 1
+
+# ------------------------
+# PASSWORD READER
+# ------------------------
+# Read the Oracle password from the home directory once at import, so a
+# missing file stops the worker at boot instead of failing a user's request.
+try:
+    with open(Path.home() / '.ora_student.txt') as f:
+        DB_PASSWORD = f.readline().strip()
+except FileNotFoundError:
+    logging.error("Password file not found.")
+    sys.exit(1)
+
+# ------------------------
+# CONNECTION POOL
+# ------------------------
+DB_USER = "s2907301"
+DB_DSN = "geoslearn"
+
+# Created once per worker; routes check connections out instead of
+# paying a full connect + authentication handshake per request.
+POOL = oracledb.create_pool(
+    user=DB_USER,
+    password=DB_PASSWORD,
+    dsn=DB_DSN,
+    config_dir="/etc/",
+    min=2,
+    max=8,
+    increment=1,
+    getmode=oracledb.POOL_GETMODE_WAIT,
+    stmtcachesize=40
+)
 
 # ------------------------
 # NAME NORMALIZATION
 # ------------------------
+# Single-pass translation tables (one C-level scan instead of chained replace calls)
+_FILESYSTEM_TABLE = str.maketrans({"'": "?", "`": "?"})
+_NO_APOSTROPHE_TABLE = str.maketrans({
+    "'": "", "`": "", '"': "",
+    '/': '-', '\\': '-',
+    ':': "", '*': "", '?': "", '<': "", '>': "", '|': ""
+})
+
 def normalize_name_for_filesystem(name):
-    normalized = name.replace("'", "?")
-    normalized = normalized.replace("'", "?")  # Curly apostrophe
-    normalized = normalized.replace("`", "?")
-    return normalized.strip()
+    return name.translate(_FILESYSTEM_TABLE).strip()
 
 def normalize_name_no_apostrophe(name):
-    normalized = name.replace("'", "")
-    normalized = normalized.replace("'", "")
-    normalized = normalized.replace("`", "")
-    normalized = normalized.replace('"', '')
-    normalized = normalized.replace('/', '-')
-    normalized = normalized.replace('\\', '-')
-    normalized = normalized.replace(':', '')
-    normalized = normalized.replace('*', '')
-    normalized = normalized.replace('?', '')
-    normalized = normalized.replace('<', '')
-    normalized = normalized.replace('>', '')
-    normalized = normalized.replace('|', '')
-    return normalized.strip()
+    return name.translate(_NO_APOSTROPHE_TABLE).strip()
 
 # ------------------------
 # IMAGE PATH HELPER
 # ------------------------
-def get_park_images(site_id, park_name):
-    images = []
-    base_path = Path('static/images')
-    
-    # Strategy 1: Try question mark version
+# Extension order matches the gallery ordering (all .jpg first, then .jpeg, ...)
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.JPG', '.JPEG', '.PNG']
+_IMAGE_EXT_RANK = {ext: rank for rank, ext in enumerate(IMAGE_EXTENSIONS)}
+
+# parks/park_<site_id>.<ext> (main image) and parks/park_<site_id>_<n>.<ext>, n = 1..19
+_PARK_IMAGE_PATTERN = re.compile(r'park_(\d+)(?:_([1-9]\d*))?')
+
+def scan_image_folder(folder):
+    """Image filenames in one folder, in gallery order, from a single scandir pass"""
+    with os.scandir(folder) as entries:
+        names = [
+            e.name for e in entries
+            if e.is_file() and os.path.splitext(e.name)[1] in _IMAGE_EXT_RANK
+        ]
+    names.sort(key=lambda n: (_IMAGE_EXT_RANK[os.path.splitext(n)[1]], n))
+    return names
+
+def build_image_index():
+    """
+    Scan static/images once: map each park folder to its image filenames, and
+    group the numbered images in parks/ by site_id, so per-park lookups need
+    no filesystem calls.
+    """
+    base_path = os.path.join(app.static_folder, 'images')
+    folders = {}
+    if os.path.isdir(base_path):
+        with os.scandir(base_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    folders[entry.name] = scan_image_folder(entry.path)
+
+    # Main image first, then numbered images (each group in extension order)
+    ranked = {}
+    for name in folders.get('parks', []):
+        stem, ext = os.path.splitext(name)
+        match = _PARK_IMAGE_PATTERN.fullmatch(stem)
+        if not match:
+            continue
+        number = int(match.group(2)) if match.group(2) else 0
+        if number > 19:
+            continue
+        key = (number > 0, _IMAGE_EXT_RANK[ext], number)
+        ranked.setdefault(match.group(1), []).append((key, f"images/parks/{name}"))
+    park_images = {site: [path for _, path in sorted(items)] for site, items in ranked.items()}
+
+    return {"folders": folders, "park_images": park_images}
+
+@functools.lru_cache(maxsize=None)
+def image_folder_candidates(park_name):
+    """
+    Folder names to try for a park, in strategy order: question mark version,
+    exact name, no apostrophe version, then lowercase versions. Each normalized
+    form is computed once and the result is reused across payload rebuilds.
+    """
     question_mark_name = normalize_name_for_filesystem(park_name)
+    no_apostrophe_name = normalize_name_no_apostrophe(park_name)
+
+    candidates = []
     if question_mark_name != park_name:
-        question_folder = base_path / question_mark_name
-        if question_folder.exists() and question_folder.is_dir():
-            for ext in ['*.jpg', '*.jpeg', '*.png', '*.JPG', '*.JPEG', '*.PNG']:
-                for img_file in sorted(question_folder.glob(ext)):
-                    relative_path = f"images/{question_mark_name}/{img_file.name}"
-                    images.append(relative_path)
-    
-    # Strategy 2: Try exact park name folder
-    if not images:
-        park_folder = base_path / park_name
-        if park_folder.exists() and park_folder.is_dir():
-            for ext in ['*.jpg', '*.jpeg', '*.png', '*.JPG', '*.JPEG', '*.PNG']:
-                for img_file in sorted(park_folder.glob(ext)):
-                    relative_path = f"images/{park_name}/{img_file.name}"
-                    images.append(relative_path)
-    
-    # Strategy 3: Try no apostrophe version
-    if not images:
-        no_apostrophe_name = normalize_name_no_apostrophe(park_name)
-        if no_apostrophe_name != park_name:
-            no_apostrophe_folder = base_path / no_apostrophe_name
-            if no_apostrophe_folder.exists() and no_apostrophe_folder.is_dir():
-                for ext in ['*.jpg', '*.jpeg', '*.png', '*.JPG', '*.JPEG', '*.PNG']:
-                    for img_file in sorted(no_apostrophe_folder.glob(ext)):
-                        relative_path = f"images/{no_apostrophe_name}/{img_file.name}"
-                        images.append(relative_path)
-    
-    # Strategy 4: Try lowercase versions
-    if not images:
-        lowercase_question = question_mark_name.lower()
-        lowercase_folder = base_path / lowercase_question
-        if lowercase_folder.exists() and lowercase_folder.is_dir():
-            for ext in ['*.jpg', '*.jpeg', '*.png', '*.JPG', '*.JPEG', '*.PNG']:
-                for img_file in sorted(lowercase_folder.glob(ext)):
-                    relative_path = f"images/{lowercase_question}/{img_file.name}"
-                    images.append(relative_path)
-                    
-    if not images:
-        lowercase_no_apostrophe = normalize_name_no_apostrophe(park_name).lower()
-        lowercase_no_apos_folder = base_path / lowercase_no_apostrophe
-        if lowercase_no_apos_folder.exists() and lowercase_no_apos_folder.is_dir():
-            for ext in ['*.jpg', '*.jpeg', '*.png', '*.JPG', '*.JPEG', '*.PNG']:
-                for img_file in sorted(lowercase_no_apos_folder.glob(ext)):
-                    relative_path = f"images/{lowercase_no_apostrophe}/{img_file.name}"
-                    images.append(relative_path)
+        candidates.append(question_mark_name)
+    candidates.append(park_name)
+    if no_apostrophe_name != park_name:
+        candidates.append(no_apostrophe_name)
+    candidates.append(question_mark_name.lower())
+    candidates.append(no_apostrophe_name.lower())
+    return tuple(candidates)
+
+def get_park_images(site_id, park_name):
+    images = []
+    index = load_image_index()
+    folders = index["folders"]
+
+    # Strategies 1-5, first folder with images wins
+    for folder in image_folder_candidates(park_name):
+        files = folders.get(folder)
+        if files:
+            images = [f"images/{folder}/{name}" for name in files]
+            break
     
     # Strategy 6: Check parks folder
-    parks_folder = base_path / 'parks'
-    if parks_folder.exists():
-        for ext in ['.jpg', '.jpeg', '.png', '.JPG', '.JPEG', '.PNG']:
-            main_image = parks_folder / f'park_{site_id}{ext}'
-            if main_image.exists():
-                relative_path = f"images/parks/park_{site_id}{ext}"
-                if relative_path not in images:
-                    images.append(relative_path)
-        
-        for ext in ['.jpg', '.jpeg', '.png', '.JPG', '.JPEG', '.PNG']:
-            for i in range(1, 20):
-                numbered_image = parks_folder / f'park_{site_id}_{i}{ext}'
-                if numbered_image.exists():
-                    relative_path = f"images/parks/park_{site_id}_{i}{ext}"
-                    if relative_path not in images:
-                        images.append(relative_path)
+    for relative_path in index["park_images"].get(str(site_id), []):
+        if relative_path not in images:
+            images.append(relative_path)
     
     return images
 
 # ------------------------
 # DISTANCE CALCULATION
 # ------------------------
-def calculate_distance(lat1, lon1, lat2, lon2):
-    R = 6371
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lon = math.radians(lon2 - lon1)
-    a = math.sin(delta_lat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    return R * c
+def haversine_vector(user_lat, user_lon, lats, lons):
+    """Great-circle distance (km) from one point to arrays of points in a single NumPy pass"""
+    lat1 = np.radians(user_lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlon = np.radians(lons - user_lon)
+    a = np.sin(dlat * 0.5)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon * 0.5)**2
+    return 2 * 6371 * np.arcsin(np.sqrt(a))
+
+# ------------------------
+# PAYLOAD CACHING
+# ------------------------
+# Park, facility and image data change rarely, so page payloads are reused
+# for this long before being rebuilt from Oracle and static/images.
+PAYLOAD_TTL_SECONDS = 600
+
+def timed_cache(seconds):
+    """Memoize a zero-argument loader, reloading once its result is older than `seconds`"""
+    def decorator(func):
+        state = {}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper():
+            with lock:
+                now = time.monotonic()
+                if "value" not in state or now - state["loaded_at"] > seconds:
+                    state["value"] = func()
+                    state["loaded_at"] = now
+                return state["value"]
+
+        # Forces a reload on the next call (e.g. after the database is updated)
+        wrapper.cache_clear = state.clear
+        return wrapper
+    return decorator
+
+# Rebuilt on the same schedule as the payloads, so newly uploaded photos appear
+load_image_index = timed_cache(PAYLOAD_TTL_SECONDS)(build_image_index)
+
+def script_json(obj):
+    """
+    Serialize for a template <script> block, escaped exactly like Jinja's |tojson.
+    Payloads are serialized once per cache refresh rather than on every render.
+    """
+    return htmlsafe_json_dumps(obj, dumps=app.json.dumps)
+
+# ------------------------
+# LOCATION SEARCH INDEX
+# ------------------------
+@timed_cache(PAYLOAD_TTL_SECONDS)
+def load_search_index():
+    """
+    Snapshot park coordinates plus a facility -> parks inverted index.
+    Held in memory (refreshed on the payload TTL) so location searches need
+    no database round-trip.
+    """
+    with POOL.acquire() as conn:
+        with conn.cursor() as cur:
+            cur.arraysize = FETCH_ARRAYSIZE
+            cur.prefetchrows = FETCH_PREFETCHROWS
+            cur.execute("""
+                SELECT site_id, site_name, latitude, longitude
+                FROM Greenspace
+                WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+                ORDER BY site_id
+            """)
+            park_rows = cur.fetchall()
+
+            cur.execute("SELECT site_id, facility_name FROM Facility WHERE facility_name IS NOT NULL")
+            facility_rows = cur.fetchall()
+
+    position = {row[0]: i for i, row in enumerate(park_rows)}
+    facility_masks = {}
+    for site_id, facility_name in facility_rows:
+        i = position.get(site_id)
+        if i is None:
+            continue
+        if facility_name not in facility_masks:
+            facility_masks[facility_name] = np.zeros(len(park_rows), dtype=bool)
+        facility_masks[facility_name][i] = True
+
+    return {
+        "site_ids": [row[0] for row in park_rows],
+        "names": [row[1] for row in park_rows],
+        "lats": np.array([float(row[2]) for row in park_rows], dtype=np.float64),
+        "lons": np.array([float(row[3]) for row in park_rows], dtype=np.float64),
+        "facility_masks": facility_masks
+    }
+
+# ------------------------
+# PAGE PAYLOADS
+# ------------------------
+def make_simd_park(row):
+    site_id, park_name = row[0], row[1]
+    return {
+        "site_id": site_id, 
+        "name": park_name, 
+        "postcode": row[2], 
+        "community": row[3],
+        "lat": float(row[4]), 
+        "lon": float(row[5]), 
+        "decile": row[6], 
+        "recreation": round(row[7], 3) if row[7] is not None else 'N/A',
+        "gallery_url": row[8],
+        "quality": round(row[9], 2) if row[9] is not None else 'N/A',
+        "quantity": round(row[10], 2) if row[10] is not None else 'N/A',
+        "safety": round(row[11], 2) if row[11] is not None else 'N/A',
+        "accessibility": round(row[12], 2) if row[12] is not None else 'N/A',
+        "images": get_park_images(site_id, park_name)
+    }
+
+# Column transforms for interaction map park rows
+ROUND3 = lambda x: round(x, 3) if x is not None else None
+OR_NA = lambda x: x if x else 'N/A'
+
+INTERACTION_PARK_KEYS = (
+    "site_id", "name", "postcode", "community", "lat", "lon", "decile",
+    "recreation", "quality", "safety", "accessibility", "quantity_variety", "gallery_url"
+)
+
+def make_interaction_park(row, facilities_map):
+    park = dict(zip(INTERACTION_PARK_KEYS, (
+        row[0], row[1], OR_NA(row[2]), OR_NA(row[3]), float(row[4]), float(row[5]), OR_NA(row[6]),
+        ROUND3(row[7]), ROUND3(row[8]), ROUND3(row[9]), ROUND3(row[10]), ROUND3(row[11]), row[12]
+    )))
+    park["images"] = get_park_images(row[0], row[1])
+    # Get facilities for this specific park
+    park["facilities"] = facilities_map.get(row[0], [])
+    return park
+
+@timed_cache(PAYLOAD_TTL_SECONDS)
+def load_simd_payload():
+    """Park records (scores, decile, images) for the SIMD map, as script-ready JSON"""
+    parks = []
+    with POOL.acquire() as conn:
+        with conn.cursor() as cur:
+            cur.arraysize = FETCH_ARRAYSIZE
+            cur.prefetchrows = FETCH_PREFETCHROWS
+            cur.execute("""
+                SELECT 
+                    g.site_id, 
+                    g.site_name, 
+                    g.postcode, 
+                    g.community_council, 
+                    g.latitude, 
+                    g.longitude,
+                    s.decile_value, 
+                    r.final_weighted_score, 
+                    g.gallery_url,
+                    r.overall_quality_score, 
+                    r.quantity_variety_score, 
+                    r.safety_score, 
+                    r.accessibility_score
+                FROM Greenspace g
+                LEFT JOIN SIMD_Datazone s ON g.datazone_id = s.datazone_id
+                LEFT JOIN Recreation_Index r ON g.site_id = r.site_id
+                ORDER BY g.site_id
+            """)
+            # Build parks one fetch batch at a time instead of holding every row first
+            while True:
+                rows = cur.fetchmany()
+                if not rows:
+                    break
+                for row in rows:
+                    parks.append(make_simd_park(row))
+    return script_json(parks)
+
+@timed_cache(PAYLOAD_TTL_SECONDS)
+def load_interaction_payload():
+    """Park records with facility lists, plus the unique facility list, for the search map (as script-ready JSON)"""
+    parks = []
+    with POOL.acquire() as conn:
+        with conn.cursor() as cur:
+            cur.arraysize = FETCH_ARRAYSIZE
+            cur.prefetchrows = FETCH_PREFETCHROWS
+            # 1. Fetch All Facilities and map site_id -> list of facilities
+            #    (grouped in Python: no LISTAGG length limit or delimiter to escape)
+            cur.execute("SELECT site_id, facility_name FROM Facility WHERE facility_name IS NOT NULL")
+            facilities_map = {}
+            for site_id, facility_name in cur:
+                facilities_map.setdefault(site_id, []).append(facility_name)
+
+            # 2. Fetch Unique Facility List (small invariant lookup, served from
+            #    the client result cache when CLIENT_RESULT_CACHE_SIZE is set on the DB)
+            cur.execute("""
+                SELECT /*+ RESULT_CACHE */ DISTINCT facility_name
+                FROM Facility
+                WHERE facility_name IS NOT NULL
+                ORDER BY facility_name
+            """)
+            facilities_json = [{"name": row[0]} for row in cur]
+
+            # 3. Fetch Basic Park Data and construct Park Objects one batch at a time
+            cur.execute("""
+                SELECT
+                    g.site_id, g.site_name, g.postcode, g.community_council, g.latitude, g.longitude,
+                    s.decile_value, ri.final_weighted_score, ri.overall_quality_score, ri.safety_score,
+                    ri.accessibility_score, ri.quantity_variety_score, g.gallery_url
+                FROM Greenspace g
+                LEFT JOIN SIMD_Datazone s ON g.datazone_id = s.datazone_id
+                LEFT JOIN Recreation_Index ri ON g.site_id = ri.site_id
+                WHERE g.latitude IS NOT NULL AND g.longitude IS NOT NULL
+                ORDER BY g.site_id
+            """)
+            while True:
+                rows = cur.fetchmany()
+                if not rows:
+                    break
+                for row in rows:
+                    parks.append(make_interaction_park(row, facilities_map))
+    
+    print(f"Loaded {len(parks)} parks with facilities")
+
+    return script_json(parks), script_json(facilities_json)
 
 # ------------------------
 # ROUTES
@@ -224,117 +520,13 @@ def index():
 
 @app.route("/simd_map")
 def simd_map():
-    password = get_password()
-    with oracledb.connect(user="s2907301", password=password, dsn="geoslearn", config_dir="/etc/") as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT 
-                    g.site_id, 
-                    g.site_name, 
-                    g.postcode, 
-                    g.community_council, 
-                    g.latitude, 
-                    g.longitude,
-                    s.decile_value, 
-                    r.final_weighted_score, 
-                    g.gallery_url,
-                    r.overall_quality_score, 
-                    r.quantity_variety_score, 
-                    r.safety_score, 
-                    r.accessibility_score
-                FROM Greenspace g
-                LEFT JOIN SIMD_Datazone s ON g.datazone_id = s.datazone_id
-                LEFT JOIN Recreation_Index r ON g.site_id = r.site_id
-                ORDER BY g.site_id
-            """)
-            rows = cur.fetchall()
-    
-    parks = []
-    for row in rows:
-        site_id, park_name = row[0], row[1]
-        image_paths = get_park_images(site_id, park_name)
-        parks.append({
-            "site_id": site_id, 
-            "name": park_name, 
-            "postcode": row[2], 
-            "community": row[3],
-            "lat": float(row[4]), 
-            "lon": float(row[5]), 
-            "decile": row[6], 
-            "recreation": round(row[7], 3) if row[7] is not None else 'N/A',
-            "gallery_url": row[8],
-            "quality": round(row[9], 2) if row[9] is not None else 'N/A',
-            "quantity": round(row[10], 2) if row[10] is not None else 'N/A',
-            "safety": round(row[11], 2) if row[11] is not None else 'N/A',
-            "accessibility": round(row[12], 2) if row[12] is not None else 'N/A',
-            "images": image_paths
-        })
-    return render_template("simd_map.html", parks=parks)
+    return render_template("simd_map.html", parks_json=load_simd_payload())
 
 @app.route("/interaction_map")
 def interaction_map():
-    password = get_password()
     try:
-        with oracledb.connect(user="s2907301", password=password, dsn="geoslearn", config_dir="/etc/") as conn:
-            with conn.cursor() as cur:
-                # 1. Fetch Basic Park Data
-                cur.execute("""
-                    SELECT
-                        g.site_id, g.site_name, g.postcode, g.community_council, g.latitude, g.longitude,
-                        s.decile_value, ri.final_weighted_score, ri.overall_quality_score, ri.safety_score,
-                        ri.accessibility_score, ri.quantity_variety_score, g.gallery_url
-                    FROM Greenspace g
-                    LEFT JOIN SIMD_Datazone s ON g.datazone_id = s.datazone_id
-                    LEFT JOIN Recreation_Index ri ON g.site_id = ri.site_id
-                    WHERE g.latitude IS NOT NULL AND g.longitude IS NOT NULL
-                    ORDER BY g.site_id
-                """)
-                park_rows = cur.fetchall()
-
-                # 2. Fetch All Facilities for All Parks
-                cur.execute("SELECT site_id, facility_name FROM Facility WHERE facility_name IS NOT NULL")
-                facility_rows = cur.fetchall()
-
-                # Map site_id -> list of facilities
-                facilities_map = collections.defaultdict(list)
-                for site_id, facility_name in facility_rows:
-                    facilities_map[site_id].append(facility_name)
-
-                # 3. Construct Park Objects
-                parks = []
-                for row in park_rows:
-                    site_id = row[0]
-                    park_name = row[1]
-                    image_paths = get_park_images(site_id, park_name)
-                    
-                    # Get facilities for this specific park
-                    park_facilities = facilities_map.get(site_id, [])
-
-                    parks.append({
-                        "site_id": site_id,
-                        "name": park_name,
-                        "postcode": row[2] if row[2] else 'N/A',
-                        "community": row[3] if row[3] else 'N/A',
-                        "lat": float(row[4]),
-                        "lon": float(row[5]),
-                        "decile": row[6] if row[6] else 'N/A',
-                        "recreation": round(row[7], 3) if row[7] is not None else None,
-                        "quality": round(row[8], 3) if row[8] is not None else None,
-                        "safety": round(row[9], 3) if row[9] is not None else None,
-                        "accessibility": round(row[10], 3) if row[10] is not None else None,
-                        "quantity_variety": round(row[11], 3) if row[11] is not None else None,
-                        "gallery_url": row[12],
-                        "images": image_paths,
-                        "facilities": park_facilities 
-                    })
-                
-                print(f"Loaded {len(parks)} parks with facilities")
-
-                # 4. Get Unique Facility List
-                unique_facilities = sorted(list(set(f for sublist in facilities_map.values() for f in sublist)))
-                facilities_json = [{"name": f} for f in unique_facilities]
-                
-        return render_template("interaction_map.html", parks=parks, facilities=facilities_json)
+        parks_json, facilities_json = load_interaction_payload()
+        return render_template("interaction_map.html", parks_json=parks_json, facilities_json=facilities_json)
         
     except Exception as e:
         print(f"Error loading interaction map: {e}")
@@ -392,44 +584,51 @@ def search_parks_by_location():
     distance = data.get('distance')
     nearest_only = data.get('nearest_only', False)
     
-    password = get_password()
+    if not facility_names:
+        return jsonify({'parks': []})
+
     try:
-        with oracledb.connect(user="s2907301", password=password, dsn="geoslearn", config_dir="/etc/") as conn:
-            with conn.cursor() as cur:
-                if not facility_names:
-                    return jsonify({'parks': []})
-                
-                # Fetch parks that have AT LEAST ONE of the facilities
-                facility_placeholders = ','.join([f":facility{i}" for i in range(len(facility_names))])
-                query = f"""
-                    SELECT DISTINCT g.site_id, g.site_name, g.latitude, g.longitude
-                    FROM Greenspace g
-                    JOIN Facility f ON g.site_id = f.site_id
-                    WHERE f.facility_name IN ({facility_placeholders})
-                      AND g.latitude IS NOT NULL AND g.longitude IS NOT NULL
-                """
-                bind_params = {f"facility{i}": name for i, name in enumerate(facility_names)}
-                cur.execute(query, bind_params)
-                candidate_parks = cur.fetchall()
-                
-                results = []
-                for row in candidate_parks:
-                    site_id, name, lat, lon = row
-                    dist = calculate_distance(user_lat, user_lon, float(lat), float(lon))
-                    
-                    if not nearest_only and distance and dist > distance:
-                        continue
-                    
-                    results.append({
-                        'site_id': site_id,
-                        'name': name,
-                        'distance': dist
-                    })
-                
-                results.sort(key=lambda x: x['distance'])
-                
-        return jsonify({'parks': results})
-        
+        index = load_search_index()
+
+        # Parks that have AT LEAST ONE of the facilities
+        has_facility = np.zeros(len(index['site_ids']), dtype=bool)
+        for name in facility_names:
+            mask = index['facility_masks'].get(name)
+            if mask is not None:
+                has_facility |= mask
+
+        # No candidate parks: nothing to measure (the user location may be absent too)
+        if not has_facility.any():
+            return app.response_class(orjson.dumps({'parks': []}), mimetype='application/json')
+
+        # Distances only for the candidate parks
+        idx = np.flatnonzero(has_facility)
+        dists = haversine_vector(user_lat, user_lon, index['lats'][idx], index['lons'][idx])
+
+        # Distance filter only applies in 'Within Distance' mode
+        if not nearest_only and distance:
+            within = dists <= distance
+            idx, dists = idx[within], dists[within]
+
+        # Survivors ordered nearest-first. Nearest mode still returns the full list:
+        # the client applies the strict AND facility filter before taking the top one.
+        order = np.argsort(dists, kind='stable')
+
+        results = [
+            {
+                'site_id': index['site_ids'][i],
+                'name': index['names'][i],
+                'distance': float(d)
+            }
+            for i, d in zip(idx[order].tolist(), dists[order].tolist())
+        ]
+
+        # orjson encodes the result dicts (and any NumPy values) in native code
+        return app.response_class(
+            orjson.dumps({'parks': results}, option=orjson.OPT_SERIALIZE_NUMPY),
+            mimetype='application/json'
+        )
+
     except Exception as e:
         print(f"Error in search: {e}")
         return jsonify({'error': str(e)}), 500
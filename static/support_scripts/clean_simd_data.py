@@ -8,46 +8,92 @@ is not Polygon or MultiPolygon.
 
 What this script does
 ---------------------
-- Reads `simd_edinburgh.geojson`
+- Streams `simd_edinburgh.geojson` one feature at a time (ijson), so memory use
+  stays at roughly one feature regardless of file size
 - Keeps only features with geometry type:
     - Polygon
     - MultiPolygon
-- Prints a message for each removed feature geometry type
-- Writes the cleaned output to:
+- Counts removed features by geometry type (reported in the summary)
+- Writes the cleaned output (compact JSON, written as it is read) to:
     `simd_edinburgh_cleaned.geojson`
+  with every other top-level member of the input (type, crs, name, bbox, ...)
+  copied through in its original order
 - Prints a summary of how many features were kept/removed
 
+Input and output paths are relative to the working directory, so run it from the
+folder holding `simd_edinburgh.geojson`. Requires ijson.
+
 """
 import json
+from collections import Counter
+import ijson
+
+COMPACT = (',', ':')
+POLYGON_TYPES = {'Polygon', 'MultiPolygon'}
+
+original_count = 0
+cleaned_count = 0
+removed_types = Counter()
 
-# Read the original file
-with open('simd_edinburgh.geojson', 'r') as f:
-    data = json.load(f)
 
-# Record the original feature count
-original_count = len(data['features'])
+def top_level_members(f):
+    """
+    Every top-level member of the FeatureCollection except the feature list, as
+    (key, value) pairs in file order; None marks where `features` sits.
+    """
+    members = []
+    builder = None
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if prefix == '':
+            if event == 'map_key':
+                if value == 'features':
+                    members.append(None)
+                    builder = None
+                else:
+                    builder = ijson.ObjectBuilder()
+                    members.append((value, builder))
+        elif builder is not None:
+            builder.event(event, value)
+    return [m if m is None else (m[0], m[1].value) for m in members]
 
-# Keep only Polygon and MultiPolygon features
-cleaned_features = []
-removed_count = 0
 
-for feature in data['features']:
-    geom_type = feature['geometry']['type']
-    if geom_type in ['Polygon', 'MultiPolygon']:
-        cleaned_features.append(feature)
-    else:
-        print(f"Removed a feature with geometry type: {geom_type}")
-        removed_count += 1
+with open('simd_edinburgh.geojson', 'rb') as src, \
+        open('simd_edinburgh_cleaned.geojson', 'w') as out:
+    # Other members (type, crs, name, bbox, ...) are copied through in their
+    # original order around the streamed feature list
+    members = top_level_members(src)
+    if None not in members:
+        members.append(None)
+    src.seek(0)
 
-# Update the data
-data['features'] = cleaned_features
+    out.write('{')
+    for i, member in enumerate(members):
+        if i:
+            out.write(',')
+        if member is not None:
+            key, value = member
+            out.write(json.dumps(key) + ':' + json.dumps(value, separators=COMPACT))
+            continue
 
-# Save the cleaned file
-with open('simd_edinburgh_cleaned.geojson', 'w') as f:
-    json.dump(data, f, indent=2)  # Add indent to make the file more readable
+        # Keep only Polygon and MultiPolygon features
+        out.write('"features":[')
+        for feature in ijson.items(src, 'features.item', use_float=True):
+            original_count += 1
+            geom_type = feature['geometry']['type']
+            if geom_type in POLYGON_TYPES:
+                if cleaned_count:
+                    out.write(',')
+                out.write(json.dumps(feature, separators=COMPACT))
+                cleaned_count += 1
+            else:
+                removed_types[geom_type] += 1
+        out.write(']')
+    out.write('}')
 
 print(f"\n=== Cleaning Summary ===")
 print(f"Original feature count: {original_count}")
-print(f"Cleaned feature count: {len(cleaned_features)}")
-print(f"Removed feature count: {removed_count}")
+print(f"Cleaned feature count: {cleaned_count}")
+print(f"Removed feature count: {sum(removed_types.values())}")
+for geom_type, count in removed_types.most_common():
+    print(f"  - {geom_type}: {count}")
 print(f"\n Saved to: simd_edinburgh_cleaned.geojson")
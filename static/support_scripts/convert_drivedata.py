@@ -11,11 +11,12 @@ What this script does
 - Reads an input file named: "drive distance.json" (expected to be in the same folder
   as this script).
 - Extracts polygon geometries from ESRI-style features (geometry.rings).
-- Creates GeoJSON Polygon features using the rings as coordinates.
+- Builds Polygon geometries from the rings in a single batched shapely call.
 - Adds a database identifier field (`db_site_id`) into each feature's properties by
   mapping ESRI `FacilityID` values to Oracle database `site_id` values using the
-  `FACILITY_TO_SITE_ID` lookup table.
-- Writes the output GeoJSON to: ./static/drive_areas.geojson (relative to this script).
+  `FACILITY_TO_SITE_ID` lookup table (shared in facility_map.py).
+- Writes the output GeoJSON to: ./static/drive_areas.geojson (relative to this script)
+  with GeoPandas/pyogrio, coordinates at 6 decimal places.
 
 Inputs / Outputs
 ----------------
@@ -31,20 +32,20 @@ Notes
 - The ID mapping is project-specific and must match the current Oracle database IDs.
 - Features without polygon rings are skipped.
 - The script ensures the `static/` directory exists before writing output.
+- Run from `static/support_scripts/` (`python convert_drivedata.py`); facility_map.py
+  is imported from the same folder. Requires numpy, shapely>=2, geopandas with
+  pyogrio and orjson.
 
 """
-import json
+import orjson
 from pathlib import Path
 import sys
 import os
+import numpy as np
+import shapely
+import geopandas as gpd
 
-# ---------------------------------------------------------
-# ID mapping table: FacilityID -> Site_ID (Oracle DB)
-# ---------------------------------------------------------
-FACILITY_TO_SITE_ID = {
-    1: 14, 2: 3, 3: 8, 4: 7, 5: 4, 6: 13, 7: 2, 8: 6, 9: 17,
-    10: 9, 11: 10, 12: 18, 13: 1, 14: 12, 15: 11, 16: 16, 17: 15, 18: 5
-}
+from facility_map import site_id_for_facility
 
 def main():
     # Get the directory where this script is located
@@ -62,11 +63,13 @@ def main():
         sys.exit(1)
 
     print(f"[INFO] Reading input file: {input_file}")
-    with open(input_file, "r", encoding="utf-8") as f:
-        esri_data = json.load(f)
+    with open(input_file, "rb") as f:
+        esri_data = orjson.loads(f.read())
 
     esri_features = esri_data.get("features", [])
-    geojson_features = []
+    properties = []
+    all_rings = []
+    ring_counts = []
     
     count = 0
     mapped_count = 0
@@ -82,39 +85,43 @@ def main():
             
         fac_id = attrs.get("FacilityID")
         
-        # Attempt to map FacilityID to database site_id
-        try:
-            lookup_id = int(fac_id) if fac_id is not None else None
-            db_id = FACILITY_TO_SITE_ID.get(lookup_id)
-        except ValueError:
-            db_id = None
+        # Map FacilityID to database site_id
+        db_id = site_id_for_facility(fac_id)
         
         attrs["db_site_id"] = db_id
 
         if db_id is not None:
             mapped_count += 1
 
-        new_feature = {
-            "type": "Feature",
-            "properties": attrs,
-            "geometry": {
-                "type": "Polygon",
-                "coordinates": rings
-            }
-        }
-        geojson_features.append(new_feature)
+        properties.append(attrs)
+        all_rings.extend(rings)
+        ring_counts.append(len(rings))
         count += 1
 
-    geojson_output = {
-        "type": "FeatureCollection",
-        "features": geojson_features
-    }
+    # Build every polygon in one shapely call: vertices are grouped into rings,
+    # and each feature's first ring is its shell and the rest are holes
+    polygons = []
+    if all_rings:
+        ring_lengths = [len(ring) for ring in all_rings]
+        coords = np.concatenate([np.asarray(ring, dtype=np.float64)[:, :2] for ring in all_rings])
+        ring_index = np.repeat(np.arange(len(ring_lengths)), ring_lengths)
+        polygon_index = np.repeat(np.arange(len(ring_counts)), ring_counts)
+        polygons = shapely.polygons(
+            shapely.linearrings(coords, indices=ring_index),
+            indices=polygon_index
+        )
+
+    gdf = gpd.GeoDataFrame(properties, geometry=polygons, crs="EPSG:4326")
+    # Keep unmatched IDs as null instead of turning the column into floats
+    # (an input with no polygon features gives a frame without the column)
+    if "db_site_id" in gdf:
+        gdf["db_site_id"] = gdf["db_site_id"].astype("Int64")
 
     # Ensure the static directory exists
     static_dir.mkdir(parents=True, exist_ok=True)
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(geojson_output, f, indent=2)
+    # GDAL's GeoJSON writer (via pyogrio) formats the output in native code
+    gdf.to_file(output_file, driver="GeoJSON", engine="pyogrio", COORDINATE_PRECISION=6)
 
     print("-" * 30)
     print(f"[SUCCESS] Successfully converted {count} driving distance areas.")
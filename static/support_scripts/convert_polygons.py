@@ -11,12 +11,13 @@ What this script does
 - Reads an input file named: "5_10_15walkingtime.json" (ESRI JSON format).
 - Extracts polygon geometries from ESRI-style features (geometry.rings).
 - Converts polygon coordinates from British National Grid (EPSG:27700) to WGS84
-  longitude/latitude (EPSG:4326) using pyproj.
+  longitude/latitude (EPSG:4326) using pyproj, rounded to 6 decimal places (~10 cm).
 - Adds a database identifier field (`db_site_id`) into each feature's properties by
   mapping ESRI `FacilityID` values to Oracle database `site_id` values using the
-  `FACILITY_TO_SITE_ID` lookup table.
-- Writes the output GeoJSON to: "areas_joined.geojson" (in the same directory as the
-  script by default, with a fallback for running from the project root).
+  `FACILITY_TO_SITE_ID` lookup table (shared in facility_map.py).
+- Writes the output GeoJSON with GeoPandas/pyogrio to: "areas_joined.geojson" (in the
+  same directory as the script by default, with a fallback for running from the
+  project root).
 
 Inputs / Outputs
 ----------------
@@ -40,19 +41,25 @@ Coordinate System Notes
 
 Usage
 -----
-Run from the command line:
+Run from `static/support_scripts/` (the ID lookup is imported from facility_map.py
+in the same folder):
     python convert_polygons.py
+Requires numpy, shapely>=2, geopandas with pyogrio, pyproj and orjson.
 """
-import json
+import orjson
+from array import array
 from pathlib import Path
 import sys
+import numpy as np
+import shapely
+import geopandas as gpd
 from pyproj import Transformer  # [Added] Required for coordinate transformation
 
-# ID mapping table
-FACILITY_TO_SITE_ID = {
-    1: 14, 2: 3, 3: 8, 4: 7, 5: 4, 6: 13, 7: 2, 8: 6, 9: 17,
-    10: 9, 11: 10, 12: 18, 13: 1, 14: 12, 15: 11, 16: 16, 17: 15, 18: 5
-}
+from facility_map import site_id_for_facility
+
+# [Added] Coordinate transformer (EPSG:27700 -> EPSG:4326), built once per process
+# 27700 is British National Grid, 4326 is geographic lon/lat (WGS84)
+TRANSFORMER = Transformer.from_crs("epsg:27700", "epsg:4326", always_xy=True)
 
 def main():
     # Set file paths
@@ -73,17 +80,22 @@ def main():
             sys.exit(1)
 
     print(f"[INFO] Reading input file: {input_file}")
-    with open(input_file, "r", encoding="utf-8") as f:
-        esri_data = json.load(f)
-
-    # [Added] Initialize coordinate transformer (EPSG:27700 -> EPSG:4326)
-    # 27700 is British National Grid, 4326 is geographic lon/lat (WGS84)
-    transformer = Transformer.from_crs("epsg:27700", "epsg:4326", always_xy=True)
+    with open(input_file, "rb") as f:
+        esri_data = orjson.loads(f.read())
 
     esri_features = esri_data.get("features", [])
-    geojson_features = []
+    properties = []
     
     mapped_count = 0
+
+    # Vertices of every kept feature as flat x/y buffers (one double each, no
+    # per-point lists), plus ring sizes; transformed together after the loop
+    xs = array("d")
+    ys = array("d")
+    ring_lengths = []
+    ring_counts = []
+    # Local aliases for the per-vertex loop
+    add_x, add_y = xs.append, ys.append
     
     for feat in esri_features:
         attrs = feat.get("attributes") or {}
@@ -95,46 +107,49 @@ def main():
             
         # 1. Handle ID mapping
         fac_id = attrs.get("FacilityID")
-        try:
-            lookup_id = int(fac_id) if fac_id is not None else None
-            db_id = FACILITY_TO_SITE_ID.get(lookup_id)
-        except ValueError:
-            db_id = None
+        db_id = site_id_for_facility(fac_id)
         
         attrs["db_site_id"] = db_id
         if db_id is not None:
             mapped_count += 1
 
-        # 2. [Key step] Transform coordinate system
-        new_rings = []
+        properties.append(attrs)
         for ring in rings:
-            converted_ring = []
+            ring_lengths.append(len(ring))
             for coord in ring:
-                # coord[0] is Easting (X), coord[1] is Northing (Y)
-                lon, lat = transformer.transform(coord[0], coord[1])
-                converted_ring.append([lon, lat])
-            new_rings.append(converted_ring)
-
-        new_feature = {
-            "type": "Feature",
-            "properties": attrs,
-            "geometry": {
-                "type": "Polygon",
-                "coordinates": new_rings  # Use transformed coordinates
-            }
-        }
-        geojson_features.append(new_feature)
-
-    geojson_output = {
-        "type": "FeatureCollection",
-        "features": geojson_features
-    }
-
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(geojson_output, f, indent=2)
+                add_x(coord[0])
+                add_y(coord[1])
+        ring_counts.append(len(rings))
+
+    # 2. [Key step] Transform coordinate system
+    # One vectorized PROJ call over every vertex instead of one call per point.
+    # coord[0] is Easting (X), coord[1] is Northing (Y)
+    polygons = []
+    if ring_lengths:
+        lons, lats = TRANSFORMER.transform(np.frombuffer(xs), np.frombuffer(ys))
+
+        # Build every polygon in one shapely call from the flat vertex array:
+        # vertices are grouped into rings, and each feature's first ring is its
+        # shell and the rest are holes
+        ring_index = np.repeat(np.arange(len(ring_lengths)), ring_lengths)
+        polygon_index = np.repeat(np.arange(len(ring_counts)), ring_counts)
+        polygons = shapely.polygons(
+            shapely.linearrings(np.stack([lons, lats], axis=1), indices=ring_index),
+            indices=polygon_index
+        )
+
+    gdf = gpd.GeoDataFrame(properties, geometry=polygons, crs="EPSG:4326")
+    # Keep unmatched IDs as null instead of turning the column into floats
+    # (an input with no polygon features gives a frame without the column)
+    if "db_site_id" in gdf:
+        gdf["db_site_id"] = gdf["db_site_id"].astype("Int64")
+
+    # 6 decimal places is ~10 cm on the ground; the extra digits only bloat the file
+    # GDAL's GeoJSON writer (via pyogrio) formats the output in native code
+    gdf.to_file(output_file, driver="GeoJSON", engine="pyogrio", COORDINATE_PRECISION=6)
 
     print(f"[SUCCESS] Generated: {output_file}")
-    print(f"[INFO] Total features: {len(geojson_features)}, Successfully mapped IDs: {mapped_count}")
+    print(f"[INFO] Total features: {len(gdf)}, Successfully mapped IDs: {mapped_count}")
 
 if __name__ == "__main__":
     main()
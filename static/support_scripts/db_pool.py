@@ -0,0 +1,61 @@
+"""
+db_pool.py
+
+Purpose
+-------
+Shared Oracle connection handling for the support scripts that query the database
+(generate_barchart.py, generate_points.py).
+
+What this module does
+---------------------
+- Reads the Oracle password from `~/.ora_student.txt`.
+- Creates one python-oracledb connection pool on first use and hands the same pool
+  to every caller, so a driver script that runs several generators pays for the
+  TNS lookup and authentication round-trip only once.
+
+Usage
+-----
+    from db_pool import get_pool
+
+    with get_pool().acquire() as connection:
+        ...
+"""
+import functools
+import sys
+from pathlib import Path
+
+import oracledb
+
+DB_USER = "s2907301"
+DB_DSN = "geoslearn"
+
+
+# ------------------------
+# PASSWORD READER
+# ------------------------
+def get_password(passfile=".ora_student.txt"):
+    """Read Oracle database password from home directory"""
+    pf = Path.home() / passfile
+    try:
+        with open(pf, "r", encoding="utf-8") as f:
+            return f.readline().strip()
+    except FileNotFoundError:
+        print(f"[ERROR] Password file not found: {pf}", file=sys.stderr)
+        sys.exit(1)
+
+
+# ------------------------
+# CONNECTION POOL
+# ------------------------
+@functools.lru_cache(maxsize=None)
+def get_pool():
+    """Create the connection pool on first call and reuse it afterwards"""
+    return oracledb.create_pool(
+        user=DB_USER,
+        password=get_password(),
+        dsn=DB_DSN,
+        config_dir="/etc/",
+        min=1,
+        max=4,
+        increment=1
+    )
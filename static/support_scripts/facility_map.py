@@ -0,0 +1,35 @@
+"""
+facility_map.py
+
+Purpose
+-------
+Single home for the ESRI `FacilityID` -> Oracle `site_id` lookup shared by the
+network-analysis conversion scripts (convert_polygons.py, convert_drivedata.py,
+process_5min_spatial_join.py).
+
+Notes
+-----
+- FacilityIDs come out of the JSON parser as native ints, so the lookup indexes a
+  tuple directly instead of coercing with int() and hashing into a dict.
+- Anything that is not a known FacilityID (None, strings, out-of-range values)
+  maps to None.
+"""
+from types import MappingProxyType
+
+# ID mapping table: FacilityID -> Site_ID (Oracle DB)
+FACILITY_TO_SITE_ID = MappingProxyType({
+    1: 14, 2: 3, 3: 8, 4: 7, 5: 4, 6: 13, 7: 2, 8: 6, 9: 17,
+    10: 9, 11: 10, 12: 18, 13: 1, 14: 12, 15: 11, 16: 16, 17: 15, 18: 5
+})
+
+# Same table indexed by FacilityID (slot 0 is unused)
+_SITE_ID_BY_FACILITY = tuple(
+    FACILITY_TO_SITE_ID.get(fac_id) for fac_id in range(max(FACILITY_TO_SITE_ID) + 1)
+)
+
+
+def site_id_for_facility(fac_id):
+    """Return the Oracle site_id for an ESRI FacilityID, or None if unmapped."""
+    if type(fac_id) is int and 0 <= fac_id < len(_SITE_ID_BY_FACILITY):
+        return _SITE_ID_BY_FACILITY[fac_id]
+    return None
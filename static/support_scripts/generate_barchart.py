@@ -11,7 +11,8 @@ What this script does
 ---------------------
 - Connects to an Oracle database and queries the `Recreation_Index` table.
 - Retrieves four normalized score metrics for each park.
-- Generates a compact SVG bar chart for each park using Matplotlib.
+- Generates a compact SVG bar chart for each park by filling a precomputed SVG
+  template (axes, grid, labels) with the park's bar heights and values.
 - Saves each chart to the `barchart/` directory, named by `site_id`
   (e.g. `12.svg`), so it can be dynamically loaded in the web interface.
 
@@ -34,14 +35,16 @@ Output:
 
 Configuration
 -------------
-- Database credentials are defined at the top of the script.
+- Database credentials and the shared connection pool live in `db_pool.py`, which
+  is imported from this script's own folder (keep the two files together).
 - Output directory and chart styling (colours, labels) are configurable
   via constants.
 
 Usage
 -----
-Run from the command line (ideally from the project root or static directory):
-    python generate_barchart.py
+Run from the `static/` directory, so the charts land in `static/barchart/`:
+    python support_scripts/generate_barchart.py
+Requires python-oracledb.
 
 Notes
 -----
@@ -50,39 +53,97 @@ Notes
 """
 
 
-import matplotlib.pyplot as plt
 import os
 import oracledb
-import sys
-import logging
-from pathlib import Path
+
+from db_pool import get_pool
 
 # ==========================================
 # CONFIGURATION
 # ==========================================
 OUTPUT_DIR = 'barchart'
 
-DB_USER = 's2907301'
-DB_DSN = "geoslearn"
-
 # Chart Styling
 COLORS = ['#36A2EB', '#FFCE56', '#FF6384', '#4BC0C0']
 METRICS = ['Facility Quality', 'Quantity & Variety', 'Safety', 'Accessibility']
+FONT = 'DejaVu Sans, Arial, Helvetica, sans-serif'
 
+# Chart Layout (pt): canvas, plot area and value range
+SVG_WIDTH, SVG_HEIGHT = 247, 245
+PLOT_LEFT, PLOT_RIGHT = 44.3, 239.6
+PLOT_TOP, PLOT_BOTTOM = 26.3, 181.6
+Y_MAX = 1.15
+Y_TICKS = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+BAR_WIDTH = 0.65
 
-# ------------------------
-# PASSWORD READER (same as myflaskapp.py)
-# ------------------------
-def get_password(passfile='.ora_student.txt'):
-    """Read Oracle database password from home directory"""
-    home = Path.home()
-    passfile = os.path.join(home, passfile)
-    try:
-        with open(passfile) as f:
-            return f.readline().strip()
-    except FileNotFoundError:
-        logging.error("Password file not found.")
-        sys.exit(1)
+
+# ==========================================
+# SVG TEMPLATE
+# ==========================================
+# Everything except the bars and their value labels is identical for every
+# park, so it is rendered once here and each chart is plain string formatting.
+# Bars sit at slots 0..n-1; the x range adds a 5% margin either side
+_BARS_SPAN = len(METRICS) - 1 + BAR_WIDTH
+_X_MIN = -BAR_WIDTH / 2 - 0.05 * _BARS_SPAN
+_X_SPAN = 1.1 * _BARS_SPAN
+
+
+def _px(x):
+    """Bar-slot coordinate -> SVG x"""
+    return PLOT_LEFT + (x - _X_MIN) / _X_SPAN * (PLOT_RIGHT - PLOT_LEFT)
+
+
+def _py(y):
+    """Score value -> SVG y"""
+    return PLOT_BOTTOM - y / Y_MAX * (PLOT_BOTTOM - PLOT_TOP)
+
+
+_SVG_HEAD = (
+    f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_WIDTH}pt" height="{SVG_HEIGHT}pt" '
+    f'viewBox="0 0 {SVG_WIDTH} {SVG_HEIGHT}" font-family="{FONT}">'
+    f'<rect width="{SVG_WIDTH}" height="{SVG_HEIGHT}" fill="#fff"/>'
+    f'<text x="{(PLOT_LEFT + PLOT_RIGHT) / 2:.1f}" y="{PLOT_TOP - 10:.1f}" text-anchor="middle" '
+    f'font-size="12" font-weight="bold" fill="#333">Park Scores</text>'
+)
+
+_SVG_FRAME = ''.join(
+    # Dashed y grid
+    [f'<path d="M{PLOT_LEFT} {_py(t):.2f}H{PLOT_RIGHT}" stroke="#b0b0b0" stroke-width="0.8" '
+     f'stroke-dasharray="3 1.5" opacity="0.3"/>' for t in Y_TICKS]
+    # Left/bottom spines only, for a cleaner look
+    + [f'<path d="M{PLOT_LEFT} {PLOT_TOP}V{PLOT_BOTTOM}H{PLOT_RIGHT}" fill="none" '
+       f'stroke="#888" stroke-width="0.8"/>']
+    # Y ticks and labels
+    + [f'<path d="M{PLOT_LEFT} {_py(t):.2f}h-3.5" stroke="#000" stroke-width="0.8"/>'
+       f'<text x="{PLOT_LEFT - 7:.1f}" y="{_py(t) + 3.2:.2f}" text-anchor="end" '
+       f'font-size="9">{t:.1f}</text>' for t in Y_TICKS]
+    # X ticks and rotated, right-aligned labels
+    + [f'<path d="M{_px(i):.2f} {PLOT_BOTTOM}v3.5" stroke="#000" stroke-width="0.8"/>'
+       f'<text transform="translate({_px(i) - 1:.2f} {PLOT_BOTTOM + 13:.1f}) rotate(-30)" '
+       f'text-anchor="end" font-size="9">{metric.replace("&", "&amp;")}</text>'
+       for i, metric in enumerate(METRICS)]
+)
+
+_BAR = '<rect x="{x:.2f}" y="{y:.2f}" width="{w:.2f}" height="{h:.2f}" fill="{color}"/>'
+_VALUE = ('<text x="{x:.2f}" y="{y:.2f}" text-anchor="middle" font-size="9" '
+          'font-weight="bold" fill="#444">{value:.2f}</text>')
+
+_BAR_LEFTS = [_px(i - BAR_WIDTH / 2) for i in range(len(METRICS))]
+_BAR_CENTERS = [_px(i) for i in range(len(METRICS))]
+_BAR_PX_WIDTH = _px(BAR_WIDTH) - _px(0)
+
+
+def render_chart(scores):
+    """Return the SVG markup for one park's four scores."""
+    bars = []
+    values = []
+    for left, center, color, score in zip(_BAR_LEFTS, _BAR_CENTERS, COLORS, scores):
+        top = _py(min(max(score, 0.0), Y_MAX))
+        bars.append(_BAR.format(x=left, y=top, w=_BAR_PX_WIDTH, h=PLOT_BOTTOM - top, color=color))
+        # Add values on top of bars
+        if score > 0:
+            values.append(_VALUE.format(x=center, y=_py(score + 0.02), value=score))
+    return _SVG_HEAD + ''.join(bars) + _SVG_FRAME + ''.join(values) + '</svg>'
 
 
 def fetch_data_from_oracle():
@@ -92,14 +153,7 @@ def fetch_data_from_oracle():
     try:
         print("Attempting to connect to Oracle...")
 
-        password = get_password()
-
-        with oracledb.connect(
-            user=DB_USER,
-            password=password,
-            dsn=DB_DSN,
-            config_dir="/etc/"
-        ) as connection:
+        with get_pool().acquire() as connection:
             with connection.cursor() as cursor:
                 sql = """
                     SELECT site_id, site_name, overall_quality_score,
@@ -150,41 +204,10 @@ def generate_charts(parks_data):
             float(park.get('access') or 0)
         ]
 
-        # Figure size: 3.5 inch width is good for popups
-        plt.figure(figsize=(3.5, 2.8))
-
-        bars = plt.bar(METRICS, scores, color=COLORS, width=0.65)
-
-        plt.ylim(0, 1.15)
-        plt.title('Park Scores', fontsize=12, fontweight='bold', color='#333', pad=10)
-
-        plt.tick_params(axis='x', labelsize=9)
-        plt.xticks(rotation=30, ha='right')
-
-        plt.tick_params(axis='y', labelsize=9)
-
-        # Add values on top of bars
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                plt.text(
-                    bar.get_x() + bar.get_width() / 2.,
-                    height + 0.02,
-                    f'{height:.2f}',
-                    ha='center', va='bottom', fontsize=9, fontweight='bold', color='#444'
-                )
-
-        # Remove top/right borders for a cleaner look
-        plt.gca().spines['top'].set_visible(False)
-        plt.gca().spines['right'].set_visible(False)
-        plt.gca().spines['left'].set_color('#888')
-        plt.gca().spines['bottom'].set_color('#888')
-        plt.grid(axis='y', linestyle='--', alpha=0.3)
-
         # Save as SVG
         filename = os.path.join(OUTPUT_DIR, f"{site_id}.svg")
-        plt.savefig(filename, format='svg', bbox_inches='tight')
-        plt.close()
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(render_chart(scores))
 
     print(f"Success! {len(parks_data)} charts saved to {OUTPUT_DIR}/")
 
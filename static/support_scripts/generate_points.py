@@ -14,12 +14,15 @@ each centroid point includes the same key attributes used elsewhere in the app.
 What this script does
 ---------------------
 - Reads an input JSON file `point_park.json` containing ESRI-style features.
-- Connects to the Oracle database (password read from `~/.ora_student.txt`).
-- Queries Greenspace + SIMD_Datazone + Recreation_Index to fetch park metadata.
+- Acquires an Oracle connection from the shared pool in `db_pool.py` (password read
+  from `~/.ora_student.txt`).
+- Queries Greenspace, SIMD_Datazone and Recreation_Index separately to fetch park
+  metadata, restricted to the Park_IDs present in the ESRI export, and left-joins
+  them with pandas.
 - Matches ESRI `Park_ID` to Oracle `site_id`.
 - Builds a GeoJSON FeatureCollection of Point features using WGS84 coordinates from
   the database (latitude/longitude).
-- Writes the merged dataset to:
+- Writes the merged dataset with GeoPandas/pyogrio to:
     static/parks_centroids_joined.geojson
   (relative to the script directory).
 
@@ -32,27 +35,22 @@ Notes
 - The script intentionally includes both `site_id` and `Park_ID` in properties to
   maintain compatibility with different downstream JavaScript/GeoJSON consumers.
 - A small debug print shows the first few matched parks and their coordinates.
+- Run from `static/support_scripts/` (`python generate_points.py`); db_pool.py is
+  imported from the same folder. Requires python-oracledb, pandas, geopandas with
+  pyogrio and orjson.
 """
 
-import json
-import oracledb
+import orjson
 from pathlib import Path
 import sys
 import os
+import pandas as pd
+import geopandas as gpd
 
-# 1. Oracle Password Reader
-def get_password(passfile=".ora_student.txt"):
-    home = Path.home()
-    pf = home / passfile
-    try:
-        with open(pf, "r", encoding="utf-8") as f:
-            return f.readline().strip()
-    except FileNotFoundError:
-        print(f"[ERROR] Password file not found: {pf}", file=sys.stderr)
-        sys.exit(1)
+from db_pool import get_pool
 
 def main():
-    # 2. File Paths
+    # 1. File Paths
     script_dir = Path(__file__).resolve().parent
     input_json = script_dir / "point_park.json"  # Source for geometry/matching
     # Output directly to static folder
@@ -63,66 +61,80 @@ def main():
         sys.exit(1)
     
     print("[INFO] Reading source points...")
-    with open(input_json, "r", encoding="utf-8") as f:
-        esri_data = json.load(f)
+    with open(input_json, "rb") as f:
+        esri_data = orjson.loads(f.read())
     
     features = esri_data.get("features", [])
     
-    # 3. Connect to DB and Fetch Detailed Info
-    password = get_password()
+    # Only the parks present in the ESRI export need to be fetched
+    park_ids = sorted({
+        (feat.get("attributes") or {}).get("Park_ID") for feat in features
+    } - {None})
+    
+    # 2. Connect to DB and Fetch Detailed Info
     try:
-        conn = oracledb.connect(
-            user="s2907301",
-            password=password,
-            dsn="geoslearn",
-            config_dir="/etc/"
-        )
+        conn = get_pool().acquire()
     except Exception as e:
         print(f"[ERROR] DB Connection failed: {e}")
         sys.exit(1)
     
     cur = conn.cursor()
+    cur.arraysize = 200
     
-    # Query matches the columns used in your SIMD Map
-    query = """
-        SELECT 
-            g.site_id, 
-            g.site_name, 
-            g.postcode, 
-            g.community_council, 
-            g.latitude, 
-            g.longitude,
-            s.decile_value, 
-            r.final_weighted_score,
-            g.gallery_url
-        FROM Greenspace g
-        LEFT JOIN SIMD_Datazone s ON g.datazone_id = s.datazone_id
-        LEFT JOIN Recreation_Index r ON g.site_id = r.site_id
+    # Each table is queried on its own and joined below, so a duplicate SIMD or
+    # Recreation_Index row cannot fan out the park rows
+    ids_filter = "SELECT column_value FROM TABLE(:site_ids)"
+    greenspace_query = f"""
+        SELECT site_id, site_name, postcode, community_council,
+               latitude, longitude, gallery_url, datazone_id
+        FROM Greenspace
+        WHERE site_id IN ({ids_filter})
+    """
+    simd_query = f"""
+        SELECT datazone_id, decile_value
+        FROM SIMD_Datazone
+        WHERE datazone_id IN (SELECT datazone_id FROM Greenspace WHERE site_id IN ({ids_filter}))
+    """
+    recreation_query = f"""
+        SELECT site_id, final_weighted_score
+        FROM Recreation_Index
+        WHERE site_id IN ({ids_filter})
     """
     
     print("[INFO] Querying Oracle Database...")
-    cur.execute(query)
+    # The IDs are bound as one collection, so the statement text is fixed
+    id_list = conn.gettype("SYS.ODCINUMBERLIST").newobject(park_ids)
     
-    # Store DB data in a dictionary for fast lookup
-    db_parks = {}
-    for row in cur:
-        site_id = row[0]
-        db_parks[site_id] = {
-            "site_name": row[1],
-            "postcode": row[2],
-            "community": row[3],
-            "lat": row[4],
-            "lon": row[5],
-            "simd_decile": row[6],
-            "recreation_score": row[7],
-            "gallery_url": row[8]
-        }
+    def fetch_frame(query, columns):
+        cur.execute(query, site_ids=id_list)
+        return pd.DataFrame(cur.fetchall(), columns=columns)
+    
+    greenspace = fetch_frame(greenspace_query, [
+        "site_id", "site_name", "postcode", "community",
+        "lat", "lon", "gallery_url", "datazone_id"
+    ])
+    simd = fetch_frame(simd_query, ["datazone_id", "simd_decile"])
+    recreation = fetch_frame(recreation_query, ["site_id", "recreation_score"])
     
     cur.close()
     conn.close()
     
-    # 4. Merge and Create GeoJSON
-    geojson_features = []
+    merged = (
+        greenspace
+        .merge(simd.drop_duplicates("datazone_id"), on="datazone_id", how="left")
+        .merge(recreation.drop_duplicates("site_id"), on="site_id", how="left")
+        .drop(columns="datazone_id")
+    )
+    # Missing matches come back as NaN; the lookup below expects None
+    merged = merged.astype(object).where(merged.notna(), None)
+    
+    # Store DB data in a dictionary for fast lookup
+    db_parks = merged.set_index("site_id").to_dict("index")
+    
+    # 3. Merge and Create GeoJSON
+    point_properties = []
+    point_lons = []
+    point_lats = []
     mapped_count = 0
     
     for feat in features:
@@ -151,14 +163,9 @@ def main():
             lon = extra.get("lon")
             
             if lat and lon:
-                geojson_features.append({
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [float(lon), float(lat)]
-                    },
-                    "properties": properties
-                })
+                point_properties.append(properties)
+                point_lons.append(float(lon))
+                point_lats.append(float(lat))
                 mapped_count += 1
         
                 if mapped_count <= 5:
@@ -166,20 +173,25 @@ def main():
                     print(f"    site_id: {properties['site_id']}")
                     print(f"    coordinates: [{lon}, {lat}]")
     
-    output_data = {
-        "type": "FeatureCollection",
-        "features": geojson_features
-    }
+    gdf = gpd.GeoDataFrame(
+        point_properties,
+        columns=["site_id", "Park_ID", "site_name", "postcode", "community",
+                 "simd_decile", "recreation_score", "gallery_url"],
+        geometry=gpd.points_from_xy(point_lons, point_lats),
+        crs="EPSG:4326"
+    )
+    # Parks without a SIMD match keep a null decile instead of a float column
+    gdf["simd_decile"] = gdf["simd_decile"].astype("Int64")
     
-    # 5. Save File
+    # 4. Save File
     output_json.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_json, "w", encoding="utf-8") as f:
-        json.dump(output_data, f, indent=2)
+    # GDAL's GeoJSON writer (via pyogrio) formats the output in native code
+    gdf.to_file(output_json, driver="GeoJSON", engine="pyogrio", COORDINATE_PRECISION=6)
     
     print("-" * 50)
     print(f"[SUCCESS] Generated: {output_json}")
     print(f"[INFO] Parks matched and enriched: {mapped_count}")
-    print(f"[INFO] Total features in output: {len(geojson_features)}")
+    print(f"[INFO] Total features in output: {len(gdf)}")
     print("-" * 50)
 
 if __name__ == "__main__":
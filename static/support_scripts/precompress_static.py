@@ -0,0 +1,68 @@
+"""
+precompress_static.py
+
+Purpose
+-------
+Write gzip sidecar files (`<name>.geojson.gz`) next to the static GeoJSON layers, so
+the Flask app can send the precompressed bytes with `Content-Encoding: gzip` instead
+of compressing multi-megabyte layers on every request.
+
+What this script does
+---------------------
+- Finds every `*.geojson` file directly under `static/`.
+- Skips layers whose sidecar is already newer than the GeoJSON.
+- Otherwise writes `<name>.geojson.gz` (gzip level 9, no embedded timestamp, so
+  rerunning on unchanged input gives identical bytes) to a temp file and renames
+  it into place, so a request arriving mid-write still gets a complete file.
+
+Notes
+-----
+- Run it on each deploy and after regenerating any layer; the app only serves a
+  sidecar that is at least as new as its GeoJSON, and compresses stale layers on the
+  fly instead. The sidecars are build output and are kept out of git, so their
+  mtimes always come from this script rather than from a checkout.
+
+Usage
+-----
+Run from `static/support_scripts/`:
+    python precompress_static.py
+"""
+import gzip
+import os
+import tempfile
+from pathlib import Path
+
+STATIC_DIR = Path(__file__).resolve().parent.parent
+
+
+def write_atomic(path, data):
+    """Write to a temp file in the same directory, then rename it over `path`, so
+    the running app never serves a half-written sidecar"""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def main():
+    written = 0
+    for source in sorted(STATIC_DIR.glob("*.geojson")):
+        sidecar = source.with_name(source.name + ".gz")
+        if sidecar.exists() and sidecar.stat().st_mtime >= source.stat().st_mtime:
+            print(f"[SKIP] {sidecar.name} is up to date")
+            continue
+
+        data = source.read_bytes()
+        write_atomic(sidecar, gzip.compress(data, compresslevel=9, mtime=0))
+        written += 1
+        print(f"[OK] {sidecar.name}: {len(data)} -> {sidecar.stat().st_size} bytes")
+
+    print(f"[SUCCESS] Wrote {written} sidecar file(s) in {STATIC_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,7 @@ each park polygon's attributes.
 
 What this script does
 ---------------------
-1) Loads input datasets (ESRI JSON exports):
+1) Streams input datasets (ESRI JSON exports) feature by feature with ijson:
    - `5_mins.json`            : polygon service areas (British National Grid, EPSG:27700)
    - `bus_5min.json`          : bus stop points (already includes Longitude/Latitude)
    - `5min_cycle.json`        : cycle parking points (British National Grid, EPSG:27700)
@@ -24,8 +24,8 @@ What this script does
    - Bus stops use their provided Longitude/Latitude values directly.
 
 3) Performs a spatial join for each park polygon:
-   - Uses a fast bounding-box (BBox) pre-check to reduce computations.
-   - Uses a ray-casting point-in-polygon test (outer ring) to decide containment.
+   - Indexes bus stops and cycle parking points in shapely STRtrees, then queries all
+     park polygons against them in one bulk `contains` query per tree.
    - Collects matching bus stops and cycle parking points.
 
 4) Writes output:
@@ -49,23 +49,36 @@ Output file:
 Notes / Assumptions
 -------------------
 - `FACILITY_TO_SITE_ID` is a project-specific lookup mapping ESRI FacilityID values
-  to Oracle database `site_id` values.
-- The point-in-polygon test uses only the first (outer) ring and does not account
-  for holes (inner rings). For typical service-area polygons this is usually fine.
-- The bounding box check is an optimisation step; the final inclusion is determined
-  by the point-in-polygon algorithm.
+  to Oracle database `site_id` values (shared in facility_map.py).
+- The first ring of each polygon is its shell and any further rings are holes;
+  points inside a hole are not matched.
+- Points lying exactly on a polygon edge are not counted as contained.
+- Run from `static/support_scripts/` (`python process_5min_spatial_join.py`);
+  facility_map.py is imported from the same folder. Requires numpy, shapely>=2,
+  pyproj, ijson and orjson.
 """
 
-import json
 import os
+import ijson
+import orjson
 import sys
+import numpy as np
+import shapely
 from pyproj import Transformer
 
-# --- CONFIGURATION ---
-FACILITY_TO_SITE_ID = {
-    1: 14, 2: 3, 3: 8, 4: 7, 5: 4, 6: 13, 7: 2, 8: 6, 9: 17,
-    10: 9, 11: 10, 12: 18, 13: 1, 14: 12, 15: 11, 16: 16, 17: 15, 18: 5
-}
+from facility_map import site_id_for_facility
+
+# Coordinate Transformer (British National Grid -> WGS84 Lat/Lon), built once per process
+TRANSFORMER = Transformer.from_crs("epsg:27700", "epsg:4326", always_xy=True)
+
+def hits_per_polygon(tree, polys):
+    """Indices of the tree points inside each polygon, in input order per polygon"""
+    polys = np.asarray(polys, dtype=object)
+    poly_idx, point_idx = tree.query(polys, predicate='contains')
+    order = np.lexsort((point_idx, poly_idx))
+    poly_idx, point_idx = poly_idx[order], point_idx[order]
+    bounds = np.searchsorted(poly_idx, np.arange(len(polys) + 1))
+    return [point_idx[bounds[k]:bounds[k + 1]] for k in range(len(polys))]
 
 def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -78,123 +91,121 @@ def main():
     # Output File
     output_file = os.path.join(script_dir, 'transport_5min_joined.geojson')
 
-    # Coordinate Transformer (British National Grid -> WGS84 Lat/Lon)
-    transformer = Transformer.from_crs("epsg:27700", "epsg:4326", always_xy=True)
-
-    # --- HELPER ALGORITHMS ---
-
-    def is_point_in_bbox(x, y, bbox):
-        """Fast check if point matches polygon bounding box"""
-        return bbox[0] <= x <= bbox[2] and bbox[1] <= y <= bbox[3]
-
-    def is_point_in_polygon(x, y, poly_rings):
-        """Ray Casting Algorithm to check if point is inside polygon rings"""
-        # Check outer ring (first ring)
-        outer_ring = poly_rings[0]
-        inside = False
-        n = len(outer_ring)
-        p1x, p1y = outer_ring[0]
-        for i in range(n + 1):
-            p2x, p2y = outer_ring[i % n]
-            if y > min(p1y, p2y):
-                if y <= max(p1y, p2y):
-                    if x <= max(p1x, p2x):
-                        if p1y != p2y:
-                            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                        if p1x == p2x or x <= xinters:
-                            inside = not inside
-            p1x, p1y = p2x, p2y
-        return inside
-
-    def get_bbox(rings):
-        """Get min_x, min_y, max_x, max_y for a polygon"""
-        all_x = [p[0] for ring in rings for p in ring]
-        all_y = [p[1] for ring in rings for p in ring]
-        return (min(all_x), min(all_y), max(all_x), max(all_y))
-
     # --- 1. LOAD AND CONVERT POINTS ---
     print("[1/4] Loading and converting points...")
     
+    # Point records for the output, with their coordinates kept alongside as a
+    # float64 (N, 2) lon/lat array for the spatial index
     all_buses = []
+    bus_xy = np.empty((0, 2), dtype=np.float64)
     if os.path.exists(bus_file):
-        with open(bus_file, 'r', encoding='utf-8') as f:
-            bus_data = json.load(f)
-        for feat in bus_data.get('features', []):
-            attrs = feat.get('attributes', {})
-            # Bus file has Longitude/Latitude directly
-            lon = attrs.get('Longitude')
-            lat = attrs.get('Latitude')
-            if lon and lat:
-                all_buses.append({
-                    "name": attrs.get('CommonName', 'Bus Stop'),
-                    "lat": lat, "lon": lon,
-                    "type": "bus"
-                })
+        bus_coords = []
+        with open(bus_file, 'rb') as f:
+            for feat in ijson.items(f, 'features.item', use_float=True):
+                attrs = feat.get('attributes', {})
+                # Bus file has Longitude/Latitude directly
+                lon = attrs.get('Longitude')
+                lat = attrs.get('Latitude')
+                if lon and lat:
+                    all_buses.append({
+                        "name": attrs.get('CommonName', 'Bus Stop'),
+                        "lat": lat, "lon": lon,
+                        "type": "bus"
+                    })
+                    bus_coords.append((lon, lat))
+        if bus_coords:
+            bus_xy = np.array(bus_coords, dtype=np.float64)
     print(f"   -> Loaded {len(all_buses)} bus stops.")
 
     all_cycles = []
+    cycle_xy = np.empty((0, 2), dtype=np.float64)
     if os.path.exists(cycle_file):
-        with open(cycle_file, 'r', encoding='utf-8') as f:
-            cycle_data = json.load(f)
-        for feat in cycle_data.get('features', []):
-            attrs = feat.get('attributes', {})
-            easting = attrs.get('eastings')
-            northing = attrs.get('northings')
-            if easting and northing:
-                lon, lat = transformer.transform(easting, northing)
-                all_cycles.append({
-                    "capacity": attrs.get('capacity', '?'),
-                    "lat": lat, "lon": lon,
-                    "type": "cycle"
-                })
+        cycle_attrs = []
+        eastings = []
+        northings = []
+        with open(cycle_file, 'rb') as f:
+            for feat in ijson.items(f, 'features.item', use_float=True):
+                attrs = feat.get('attributes', {})
+                easting = attrs.get('eastings')
+                northing = attrs.get('northings')
+                if easting and northing:
+                    cycle_attrs.append(attrs)
+                    eastings.append(easting)
+                    northings.append(northing)
+        # One transform call for every cycle spot
+        lons, lats = TRANSFORMER.transform(
+            np.asarray(eastings, dtype=np.float64), np.asarray(northings, dtype=np.float64)
+        )
+        cycle_xy = np.column_stack([lons, lats])
+        for attrs, lon, lat in zip(cycle_attrs, lons.tolist(), lats.tolist()):
+            all_cycles.append({
+                "capacity": attrs.get('capacity', '?'),
+                "lat": lat, "lon": lon,
+                "type": "cycle"
+            })
     print(f"   -> Loaded {len(all_cycles)} cycle spots.")
 
+    # Spatial indexes over the points: each polygon query only refines the points
+    # whose bounding boxes it overlaps, all inside GEOS
+    bus_tree = shapely.STRtree(shapely.points(bus_xy))
+    cycle_tree = shapely.STRtree(shapely.points(cycle_xy))
+
     # --- 2. PROCESS POLYGONS & PERFORM SPATIAL JOIN ---
     print("[2/4] Processing polygons and performing spatial join...")
     
     geojson_features = []
     
     if os.path.exists(poly_file):
-        with open(poly_file, 'r', encoding='utf-8') as f:
-            poly_data = json.load(f)
-            
-        for feature in poly_data.get('features', []):
-            attrs = feature.get('attributes', {})
-            geom = feature.get('geometry', {})
-            
-            # Identify Park
-            fac_id = attrs.get('FacilityID')
-            site_id = FACILITY_TO_SITE_ID.get(fac_id)
-            if not site_id: continue
-
-            # Convert Rings to Lat/Lon
-            rings = geom.get('rings', [])
-            latlon_rings = []
-            for ring in rings:
-                converted_ring = []
-                for coord in ring:
-                    lon, lat = transformer.transform(coord[0], coord[1])
-                    converted_ring.append([lon, lat])
-                latlon_rings.append(converted_ring)
-
-            # Spatial Join Logic
-            matched_buses = []
-            matched_cycles = []
-            
-            # Optimization: Calculate Bounding Box
-            bbox = get_bbox(latlon_rings)
-
-            # Check Buses
-            for bus in all_buses:
-                if is_point_in_bbox(bus['lon'], bus['lat'], bbox):
-                    if is_point_in_polygon(bus['lon'], bus['lat'], latlon_rings):
-                        matched_buses.append(bus)
-
-            # Check Cycles
-            for cycle in all_cycles:
-                if is_point_in_bbox(cycle['lon'], cycle['lat'], bbox):
-                    if is_point_in_polygon(cycle['lon'], cycle['lat'], latlon_rings):
-                        matched_cycles.append(cycle)
+        # Keep the park polygons first, so all ring vertices share one transform call
+        parks = []
+        xs = []
+        ys = []
+        ring_lengths = []
+        # Local aliases for the per-vertex loop
+        add_x, add_y = xs.append, ys.append
+        with open(poly_file, 'rb') as f:
+            for feature in ijson.items(f, 'features.item', use_float=True):
+                attrs = feature.get('attributes', {})
+                
+                # Identify Park
+                site_id = site_id_for_facility(attrs.get('FacilityID'))
+                if not site_id: continue
+
+                rings = feature.get('geometry', {}).get('rings', [])
+                if not rings: continue
+                parks.append((site_id, attrs, len(rings)))
+                for ring in rings:
+                    ring_lengths.append(len(ring))
+                    for coord in ring:
+                        add_x(coord[0])
+                        add_y(coord[1])
+
+        # Convert Rings to Lat/Lon
+        lons, lats = TRANSFORMER.transform(
+            np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+        )
+        lonlat = np.column_stack([lons, lats])
+        all_rings = np.split(lonlat, np.cumsum(ring_lengths)[:-1]) if ring_lengths else []
+
+        # Build every park polygon in one shapely call from the flat vertex array:
+        # vertices are grouped into rings, and each park's first ring is its shell
+        # and the rest are holes
+        ring_index = np.repeat(np.arange(len(ring_lengths)), ring_lengths)
+        polygon_index = np.repeat(np.arange(len(parks)), [ring_count for _, _, ring_count in parks])
+        polys = shapely.polygons(shapely.linearrings(lonlat, indices=ring_index), indices=polygon_index)
+
+        # Spatial Join Logic
+        # Every polygon is queried against each tree in a single bulk GEOS call
+        bus_hits = hits_per_polygon(bus_tree, polys)
+        cycle_hits = hits_per_polygon(cycle_tree, polys)
+
+        ring_start = 0
+        for k, (site_id, attrs, ring_count) in enumerate(parks):
+            latlon_rings = [ring.tolist() for ring in all_rings[ring_start:ring_start + ring_count]]
+            ring_start += ring_count
+
+            matched_buses = [all_buses[i] for i in bus_hits[k]]
+            matched_cycles = [all_cycles[i] for i in cycle_hits[k]]
 
             # Build Feature
             new_feature = {
@@ -217,8 +228,9 @@ def main():
     print(f"[3/4] Saving to {output_file}...")
     output_geojson = { "type": "FeatureCollection", "features": geojson_features }
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_geojson, f, indent=2)
+    # Compact output; orjson serializes in native code
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(output_geojson))
         
     print("[4/4] Done! Refresh your web page.")
 
@@ -8,7 +8,7 @@ for the Network Analysis dropdown/filter.
 
 What this script does
 ---------------------
-- Reads three ESRI/ArcGIS-exported JSON files:
+- Streams three ESRI/ArcGIS-exported JSON files (feature by feature, with ijson):
   1) `park_polygon.json`        : park polygons (British National Grid, EPSG:27700)
   2) `near_3_stop_bus.json`     : results of a "Generate Near Table" style join for buses
   3) `near3_cyclepark.json`     : results of a "Generate Near Table" style join for cycle parks
@@ -39,13 +39,28 @@ Notes / Assumptions
   link IDs. This reflects how the ArcGIS near table indices were produced in this dataset.
 - Ensure the three input files exist in the same directory as this script before running.
 - The output file is written to a `static/` subfolder (created if missing).
+- Run from `static/support_scripts/` (`python process_bus_cycle_data.py`).
+  Requires numpy, pyproj, ijson and orjson.
 
 """
 
-import json
 import os
+import ijson
+import orjson
+import numpy as np
 from pyproj import Transformer
 
+# Coordinate transformation (EPSG:27700 -> EPSG:4326), built once per process
+TRANSFORMER = Transformer.from_crs("epsg:27700", "epsg:4326", always_xy=True)
+
+# Sort key for near-table rows without a NEAR_RANK (they go last)
+NO_RANK = np.iinfo(np.int32).max
+
+def top_by_rank(records, ranks, k=3):
+    """First k records by ascending rank; ties keep their input order"""
+    order = np.argsort(np.asarray(ranks, dtype=np.int32), kind='stable')[:k]
+    return [records[i] for i in order]
+
 def main():
     # 1. Set file paths
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -61,87 +76,116 @@ def main():
         return
 
     print("[INFO] Reading input data...")
-    with open(park_file, 'r', encoding='utf-8') as f: park_data = json.load(f)
-    with open(bus_file, 'r', encoding='utf-8') as f: bus_data = json.load(f)
-    with open(cycle_file, 'r', encoding='utf-8') as f: cycle_data = json.load(f)
 
-    # 2. Initialize coordinate transformation (EPSG:27700 -> EPSG:4326)
-    transformer = Transformer.from_crs("epsg:27700", "epsg:4326", always_xy=True)
-
-    # 3. Build bus stop lookup table
+    # 2. Build bus stop lookup table
+    # Each link ID maps to its stop records and their ranks (parallel lists)
     bus_lookup = {}
-    for feature in bus_data.get('features', []):
-        attrs = feature.get('attributes', {})
-        link_id = attrs.get('park_FeatureTo_GenerateNearT2.IN_FID')
-        if link_id is not None:
-            stop = {
-                "name": attrs.get('bus_ExportFeatures.CommonName'),
-                "lat": attrs.get('bus_ExportFeatures.Latitude'),
-                "lon": attrs.get('bus_ExportFeatures.Longitude'),
-                "rank": attrs.get('park_FeatureTo_GenerateNearT2.NEAR_RANK'),
-                "distance": attrs.get('park_FeatureTo_GenerateNearT2.NEAR_DIST')
-            }
-            if link_id not in bus_lookup: bus_lookup[link_id] = []
-            bus_lookup[link_id].append(stop)
+    bus_ranks = {}
+    with open(bus_file, 'rb') as f:
+        for feature in ijson.items(f, 'features.item', use_float=True):
+            attrs = feature.get('attributes', {})
+            link_id = attrs.get('park_FeatureTo_GenerateNearT2.IN_FID')
+            if link_id is not None:
+                stop = {
+                    "name": attrs.get('bus_ExportFeatures.CommonName'),
+                    "lat": attrs.get('bus_ExportFeatures.Latitude'),
+                    "lon": attrs.get('bus_ExportFeatures.Longitude'),
+                    "rank": attrs.get('park_FeatureTo_GenerateNearT2.NEAR_RANK'),
+                    "distance": attrs.get('park_FeatureTo_GenerateNearT2.NEAR_DIST')
+                }
+                if link_id not in bus_lookup:
+                    bus_lookup[link_id] = []
+                    bus_ranks[link_id] = []
+                bus_lookup[link_id].append(stop)
+                bus_ranks[link_id].append(NO_RANK if stop['rank'] is None else stop['rank'])
+
+    # 3. Build cycle parking lookup table (with coordinate transformation)
+    cycle_links = []
+    cycle_xs = []
+    cycle_ys = []
+    with open(cycle_file, 'rb') as f:
+        for feature in ijson.items(f, 'features.item', use_float=True):
+            attrs = feature.get('attributes', {})
+            geom = feature.get('geometry', {})
+            link_id = attrs.get('cycle.IN_FID')
+        
+            if link_id is not None:
+                x = geom.get('x')
+                y = geom.get('y')
+                if x and y:
+                    cycle_links.append((link_id, attrs))
+                    cycle_xs.append(x)
+                    cycle_ys.append(y)
+
+    # Transform coordinates (x, y -> lon, lat) for every cycle spot in one call
+    cycle_lons, cycle_lats = TRANSFORMER.transform(
+        np.asarray(cycle_xs, dtype=np.float64), np.asarray(cycle_ys, dtype=np.float64)
+    )
 
-    # 4. Build cycle parking lookup table (with coordinate transformation)
     cycle_lookup = {}
-    for feature in cycle_data.get('features', []):
-        attrs = feature.get('attributes', {})
-        geom = feature.get('geometry', {})
-        link_id = attrs.get('cycle.IN_FID')
-        
-        if link_id is not None:
-            # Transform coordinates (x, y -> lon, lat)
-            x = geom.get('x')
-            y = geom.get('y')
-            if x and y:
-                lon, lat = transformer.transform(x, y)
-                cycle_spot = {
-                    "type": attrs.get('cycleparking.bicycle_pa'),
-                    "capacity": attrs.get('cycleparking.capacity'),
-                    "lat": lat,
-                    "lon": lon,
-                    "rank": attrs.get('cycle.NEAR_RANK'),
-                    "distance": attrs.get('cycle.NEAR_DIST')
-                }
-                if link_id not in cycle_lookup: cycle_lookup[link_id] = []
-                cycle_lookup[link_id].append(cycle_spot)
+    cycle_ranks = {}
+    for (link_id, attrs), lon, lat in zip(cycle_links, cycle_lons.tolist(), cycle_lats.tolist()):
+        cycle_spot = {
+            "type": attrs.get('cycleparking.bicycle_pa'),
+            "capacity": attrs.get('cycleparking.capacity'),
+            "lat": lat,
+            "lon": lon,
+            "rank": attrs.get('cycle.NEAR_RANK'),
+            "distance": attrs.get('cycle.NEAR_DIST')
+        }
+        if link_id not in cycle_lookup:
+            cycle_lookup[link_id] = []
+            cycle_ranks[link_id] = []
+        cycle_lookup[link_id].append(cycle_spot)
+        cycle_ranks[link_id].append(NO_RANK if cycle_spot['rank'] is None else cycle_spot['rank'])
+
+    # 4. Transform park geometry coordinates
+    # Every ring vertex goes through one transform call, then is split back into rings
+    park_attrs = []
+    xs = []
+    ys = []
+    ring_lengths = []
+    ring_counts = []
+    # Local aliases for the per-vertex loop
+    add_x, add_y = xs.append, ys.append
+    with open(park_file, 'rb') as f:
+        for feature in ijson.items(f, 'features.item', use_float=True):
+            park_attrs.append(feature.get('attributes', {}))
+            rings = feature.get('geometry', {}).get('rings', [])
+            ring_counts.append(len(rings))
+            for ring in rings:
+                ring_lengths.append(len(ring))
+                for coord in ring:
+                    add_x(coord[0])
+                    add_y(coord[1])
+
+    lons, lats = TRANSFORMER.transform(np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64))
+    lonlat = np.column_stack([lons, lats])
+    all_rings = [ring.tolist() for ring in np.split(lonlat, np.cumsum(ring_lengths)[:-1])] if ring_lengths else []
 
     # 5. Generate GeoJSON
     geojson_features = []
     
-    for feature in park_data.get('features', []):
-        attrs = feature.get('attributes', {})
-        geom = feature.get('geometry', {})
-        
+    ring_start = 0
+    for attrs, ring_count in zip(park_attrs, ring_counts):
         fid = attrs.get('FID')      # 0, 1, 2...
         park_id = attrs.get('Park_ID')
         
         # Matching logic: FID + 1
-        bus_stops = bus_lookup.get(fid + 1, [])
-        bus_stops.sort(key=lambda x: x['rank'] if x['rank'] is not None else 999)
+        bus_stops = top_by_rank(bus_lookup.get(fid + 1, []), bus_ranks.get(fid + 1, []))
         
-        cycle_spots = cycle_lookup.get(fid + 1, [])
-        cycle_spots.sort(key=lambda x: x['rank'] if x['rank'] is not None else 999)
-
-        # Transform park geometry coordinates
-        rings = geom.get('rings', [])
-        new_rings = []
-        for ring in rings:
-            converted_ring = []
-            for coord in ring:
-                lon, lat = transformer.transform(coord[0], coord[1])
-                converted_ring.append([lon, lat])
-            new_rings.append(converted_ring)
+        cycle_spots = top_by_rank(cycle_lookup.get(fid + 1, []), cycle_ranks.get(fid + 1, []))
+
+        new_rings = all_rings[ring_start:ring_start + ring_count]
+        ring_start += ring_count
 
         new_feature = {
             "type": "Feature",
             "properties": {
                 "site_id": park_id, 
                 "name": attrs.get('NAME') or attrs.get('Name_1'),
-                "bus_stops": bus_stops[:3],     # Top 3 Bus
-                "cycle_parks": cycle_spots[:3]  # Top 3 Cycle
+                "bus_stops": bus_stops,     # Top 3 Bus
+                "cycle_parks": cycle_spots  # Top 3 Cycle
             },
             "geometry": {
                 "type": "Polygon",
@@ -157,8 +201,9 @@ def main():
 
     # 6. Save output
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_geojson, f, indent=2)
+    # Compact output; orjson serializes in native code
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(output_geojson))
 
     print(f"[Success] Generated: {output_file}")
     if len(geojson_features) > 0:
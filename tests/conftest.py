@@ -0,0 +1,31 @@
+"""
+Shared fixtures for the Flask app tests.
+
+The app reads the Oracle password and opens its pool at import, so the fixture
+points HOME at a temporary password file and replaces oracledb.create_pool
+before importing.
+"""
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("oracledb")
+pytest.importorskip("flask_compress")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture
+def app_module(tmp_path, monkeypatch):
+    import oracledb
+
+    home = tmp_path / "home"
+    home.mkdir()
+    (home / ".ora_student.txt").write_text("secret\n")
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setattr(oracledb, "create_pool", lambda **kwargs: object())
+    sys.modules.pop("myflaskapp", None)
+    yield importlib.import_module("myflaskapp")
+    sys.modules.pop("myflaskapp", None)
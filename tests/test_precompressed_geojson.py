@@ -0,0 +1,47 @@
+"""
+Tests for serving static GeoJSON from precompressed gzip sidecars.
+"""
+import gzip
+import os
+
+import pytest
+
+LAYER = b'{"type":"FeatureCollection","features":[]}' * 50
+
+
+@pytest.fixture
+def static_dir(app_module, tmp_path, monkeypatch):
+    static = tmp_path / "static"
+    static.mkdir()
+    (static / "layer.geojson").write_bytes(LAYER)
+    (static / "layer.geojson.gz").write_bytes(gzip.compress(LAYER, mtime=0))
+    monkeypatch.setattr(app_module.app, "static_folder", str(static))
+    return static
+
+
+def get_layer(app_module, accept_encoding):
+    client = app_module.app.test_client()
+    return client.get("/static/layer.geojson", headers={"Accept-Encoding": accept_encoding})
+
+
+def test_fresh_sidecar_is_sent_gzip_encoded(app_module, static_dir):
+    response = get_layer(app_module, "gzip, deflate, br")
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.mimetype == "application/geo+json"
+    assert gzip.decompress(response.get_data()) == LAYER
+
+
+def test_stale_sidecar_is_ignored(app_module, static_dir):
+    sidecar = static_dir / "layer.geojson.gz"
+    older = (static_dir / "layer.geojson").stat().st_mtime - 60
+    os.utime(sidecar, (older, older))
+    response = get_layer(app_module, "gzip")
+    assert "Content-Encoding" not in response.headers
+    assert response.get_data() == LAYER
+
+
+def test_client_without_gzip_gets_plain_layer(app_module, static_dir):
+    response = get_layer(app_module, "identity")
+    assert "Content-Encoding" not in response.headers
+    assert response.get_data() == LAYER
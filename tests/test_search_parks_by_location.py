@@ -0,0 +1,39 @@
+"""
+Tests for the /search_parks_by_location route.
+
+The search index is swapped for an in-memory one, so no database is needed.
+"""
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def client(app_module, monkeypatch):
+    index = {
+        "site_ids": [1, 2, 3],
+        "names": ["Far Park", "Near Park", "Middle Park"],
+        "lats": np.array([55.99, 55.951, 55.96]),
+        "lons": np.array([-3.30, -3.19, -3.20]),
+        "facility_masks": {
+            "Playground": np.array([True, True, False]),
+            "Toilets": np.array([False, True, True]),
+        },
+    }
+    monkeypatch.setattr(app_module, "load_search_index", lambda: index)
+    return app_module.app.test_client()
+
+
+def test_no_matching_facility_without_location_returns_empty(client):
+    response = client.post("/search_parks_by_location", json={"facilities": ["Skatepark"]})
+    assert response.status_code == 200
+    assert response.get_json() == {"parks": []}
+
+
+def test_matches_are_filtered_by_distance_and_sorted_nearest_first(client):
+    response = client.post("/search_parks_by_location", json={
+        "facilities": ["Playground", "Toilets"],
+        "user_lat": 55.95, "user_lon": -3.19,
+        "distance": 5,
+    })
+    assert response.status_code == 200
+    assert [park["site_id"] for park in response.get_json()["parks"]] == [2, 3]